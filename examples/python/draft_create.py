@@ -1,31 +1,333 @@
 # draft_create.py - Create Substack drafts
 import os
 import json
+import logging
+import threading
+import concurrent.futures
+from pathlib import Path
+import functools
+import itertools
 import requests
-import re
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
 
+# Use orjson for draft body (de)serialization when it is installed.
+# Both paths emit compact JSON (no whitespace after separators).
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    def _dumps(obj):
+        return orjson.dumps(obj).decode('utf-8')
+    _dumps_bytes = orjson.dumps
+    _loads = orjson.loads
+else:
+    _dumps = functools.partial(json.dumps, separators=(',', ':'))
+    def _dumps_bytes(obj):
+        return _dumps(obj).encode('utf-8')
+    _loads = json.loads
+
+# The third-party regex module scans the inline-mark alternation faster
+# than re; the patterns below match the same text under both
+try:
+    import regex as _re
+except ImportError:
+    import re as _re
+
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+# Snapshot configuration from the environment once at import
+_SID, _SUBSTACK_LLI, _SUBSTACK_SID, _PUB_URL, _USER_ID = (
+    os.getenv(key)
+    for key in ("SID", "SUBSTACK_LLI", "SUBSTACK_SID", "PUBLICATION_URL", "USER_ID")
+)
+
 # Setup session
 session = requests.Session()
 session.headers.update({
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-    "Referer": os.getenv("PUBLICATION_URL"),
+    "Referer": _PUB_URL,
     "Content-Type": "application/json"
 })
 
+# Keep connections alive across calls and retry transient failures.
+# Read and status retries are limited to idempotent methods, and other
+# errors (e.g. SSLError) are not retried, so draft POSTs are never replayed;
+# only connect failures, raised before anything is sent, are retried.
+adapter = HTTPAdapter(
+    pool_connections=20,
+    pool_maxsize=50,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=[429, 500, 502, 503, 504],
+        other=0,
+        raise_on_status=False
+    )
+)
+session.mount("https://", adapter)
+
 # Set cookies
 cookie_map = {
-    "sid": os.getenv("SID"),
-    "substack.lli": os.getenv("SUBSTACK_LLI"),
-    "substack.sid": os.getenv("SUBSTACK_SID")
+    "sid": _SID,
+    "substack.lli": _SUBSTACK_LLI,
+    "substack.sid": _SUBSTACK_SID
 }
 for k, v in cookie_map.items():
     if v:
         session.cookies.set(k, v, domain=".substack.com")
 
-pub_url = os.getenv("PUBLICATION_URL")
+pub_url = _PUB_URL
+
+# Precompiled patterns used by the markup parser.
+# Inline marks are matched in a single left-to-right scan; the group name
+# doubles as the Substack mark type.
+_INLINE_RE = _re.compile(
+    r'(?P<strong>\*\*(.+?)\*\*)'            # **bold**
+    r'|(?P<em>\*(.+?)\*)'                   # *italic*
+    r'|(?P<strikethrough>~~(.+?)~~)'        # ~~strikethrough~~
+    r'|(?P<code>`(.+?)`)'                   # `code`
+    r'|(?P<link>\[([^\]]+)\]\(([^)]+)\))'   # [text](url)
+)
+# Characters that can start an inline mark
+_INLINE_MARKERS = '*~`['
+# Link mark attrs; "href" is filled in per link (listed first to keep key order)
+_LINK_MARK_ATTRS = {
+    "href": None,
+    "target": "_blank",
+    "rel": "noopener noreferrer nofollow",
+    "class": None
+}
+_NUMBERLIST_RE = _re.compile(r'\d+\.')
+# regex's \s leaves out \x1c-\x1f, which re counts as whitespace; _WS
+# spells out re's set so both modules skip the same characters
+_WS = r'[\s\x1c-\x1f]'
+_FOOTNOTE_RE = _re.compile(r'\[(\d+)\]' + _WS + r'*(.*)')
+# First Title:: block in a markup file; group 1 is its raw text
+_TITLE_RE = _re.compile(r'(?:^|\|)' + _WS + r'*Title::([^|]*)')
+
+
+def _wrap_paragraph_text(kind, text, extra_attrs=None):
+    """Build a block node wrapping a single paragraph of plain text"""
+    node = {"type": kind}
+    if extra_attrs is not None:
+        node["attrs"] = extra_attrs
+    node["content"] = [{
+        "type": "paragraph",
+        "content": [{"type": "text", "text": text}]
+    }]
+    return node
+
+
+# Block handlers: each takes the block content and the parse context and
+# returns the node to append, or None to skip the block.
+
+def _h_heading(block_content, ctx, level):
+    return {
+        "type": "heading",
+        "attrs": {"level": level},
+        "content": [{"type": "text", "text": block_content}]
+    }
+
+
+def _h_text(block_content, ctx):
+    return {
+        "type": "paragraph",
+        "content": parse_inline_formatting(block_content)
+    }
+
+
+def _h_quote(block_content, ctx):
+    return _wrap_paragraph_text("blockquote", block_content)
+
+
+def _h_pullquote(block_content, ctx):
+    return _wrap_paragraph_text(
+        "pullquote", block_content, {"align": None, "color": None}
+    )
+
+
+def _list_items(items):
+    list_items = []
+    for item in items:
+        list_items.append({
+            "type": "list_item",
+            "content": [{
+                "type": "paragraph",
+                "content": parse_inline_formatting(item)
+            }]
+        })
+    return list_items
+
+
+def _h_list(block_content, ctx):
+    items = [item for item in (i.strip() for i in block_content.split('•')) if item]
+    return {
+        "type": "bullet_list",
+        "content": _list_items(items)
+    }
+
+
+def _h_numberlist(block_content, ctx):
+    # Split by numbers (1. 2. 3. etc.), skipping the text before the first marker
+    parts = itertools.islice(_NUMBERLIST_RE.split(block_content), 1, None)
+    items = [item for item in (part.strip() for part in parts) if item]
+    return {
+        "type": "ordered_list",
+        "attrs": {"start": 1, "order": 1},
+        "content": _list_items(items)
+    }
+
+
+def _h_code(block_content, ctx):
+    # Format: language | code content
+    language, sep, code = block_content.partition('|')
+    if sep:
+        language = language.strip() or None
+        code = code.strip()
+    else:
+        language = None
+        code = block_content
+    
+    return {
+        "type": "code_block",
+        "attrs": {"language": language},
+        "content": [{"type": "text", "text": code}]
+    }
+
+
+def _h_rule(block_content, ctx):
+    return {"type": "horizontal_rule"}
+
+
+def _h_button(block_content, ctx):
+    # Format: Button Text -> url
+    text, sep, url = block_content.partition('->')
+    if sep:
+        text = text.strip()
+        url = url.strip()
+    else:
+        url = "#"
+    
+    return {"type": "button", "attrs": _button_attrs(url, text)}
+
+
+def _h_magic_button(block_content, ctx, attrs):
+    # Copy the constant attrs and fill in the text; key order is preserved
+    return {"type": "button", "attrs": {**attrs, "text": block_content}}
+
+
+def _button_attrs(url, text=None):
+    return {"url": url, "text": text, "action": None, "class": None}
+
+
+def _h_subscribewidget(block_content, ctx):
+    # Format: Button >> Description
+    button_text, sep, description = block_content.partition('>>')
+    if sep:
+        button_text = button_text.strip()
+        description = description.strip()
+    else:
+        description = "Subscribe for more content!"
+    
+    return {
+        "type": "subscribeWidget",
+        "attrs": {
+            "url": "%%checkout_url%%",
+            "text": button_text,
+            "language": "en"
+        },
+        "content": [{
+            "type": "ctaCaption",
+            "content": [{"type": "text", "text": description}]
+        }]
+    }
+
+
+def _h_sharewidget(block_content, ctx):
+    # Format: Button >> Description
+    button_text, sep, description = block_content.partition('>>')
+    if sep:
+        button_text = button_text.strip()
+        description = description.strip()
+    else:
+        description = "Share this post!"
+    
+    return {
+        "type": "captionedShareButton",
+        "attrs": {
+            "url": "%%share_url%%",
+            "text": button_text
+        },
+        "content": [{
+            "type": "ctaCaption",
+            "content": [{"type": "text", "text": description}]
+        }]
+    }
+
+
+def _h_latex(block_content, ctx):
+    node = {
+        "type": "latex_block",
+        "attrs": {
+            "persistentExpression": block_content,
+            "id": f"EQUATION_{ctx['footnote_counter']}"
+        }
+    }
+    ctx['footnote_counter'] += 1
+    return node
+
+
+def _h_footnote(block_content, ctx):
+    # Format: [1] footnote text
+    match = _FOOTNOTE_RE.match(block_content)
+    if not match:
+        return None
+    num = int(match.group(1))
+    text = match.group(2)
+    
+    # Add footnote anchor in text (this should be done manually by user in Text:: blocks)
+    # Add footnote definition at end
+    return _wrap_paragraph_text("footnote", text, {"number": num})
+
+
+def _h_break(block_content, ctx):
+    return {"type": "paragraph"}
+
+
+_HANDLERS = {
+    "title": functools.partial(_h_heading, level=1),
+    "subtitle": functools.partial(_h_heading, level=2),
+    "text": _h_text,
+    "quote": _h_quote,
+    "pullquote": _h_pullquote,
+    "list": _h_list,
+    "numberlist": _h_numberlist,
+    "code": _h_code,
+    "rule": _h_rule,
+    "button": _h_button,
+    "subscribe": functools.partial(
+        _h_magic_button, attrs=_button_attrs("%%checkout_url%%")
+    ),
+    "share": functools.partial(
+        _h_magic_button, attrs=_button_attrs("%%share_url%%")
+    ),
+    "comment": functools.partial(
+        _h_magic_button, attrs=_button_attrs("%%half_magic_comments_url%%")
+    ),
+    "subscribewidget": _h_subscribewidget,
+    "sharewidget": _h_sharewidget,
+    "latex": _h_latex,
+    "footnote": _h_footnote,
+    "break": _h_break,
+}
+_HANDLERS.update({f"h{i}": functools.partial(_h_heading, level=i) for i in range(1, 7)})
+
 
 def parse_markup_to_json(markup_text):
     """
@@ -45,392 +347,236 @@ def parse_markup_to_json(markup_text):
     markup_text = markup_text.replace(';', ',')
     
     # Split by main separator |
-    blocks = [block.strip() for block in markup_text.split('|') if block.strip()]
+    blocks = filter(None, map(str.strip, markup_text.split('|')))
     
     content = []
-    footnote_counter = 1
+    ctx = {"footnote_counter": 1}
+    # Bind the per-block lookups once, outside the loop
+    append = content.append
+    get_handler = _HANDLERS.get
     
     for block in blocks:
-        if '::' not in block:
+        block_type, sep, block_content = block.partition('::')
+        if not sep:
             # Treat as regular text if no type specified
-            content.append({
+            append({
                 "type": "paragraph",
                 "content": parse_inline_formatting(block)
             })
             continue
             
-        block_type, block_content = block.split('::', 1)
         block_type = block_type.strip().lower()
         block_content = block_content.strip()
         
         if not block_content:
             continue
-            
-        if block_type == 'title':
-            content.append({
-                "type": "heading",
-                "attrs": {"level": 1},
-                "content": [{"type": "text", "text": block_content}]
-            })
-            
-        elif block_type == 'subtitle':
-            content.append({
-                "type": "heading", 
-                "attrs": {"level": 2},
-                "content": [{"type": "text", "text": block_content}]
-            })
-            
-        elif block_type in ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']:
-            level = int(block_type[1])
-            content.append({
-                "type": "heading",
-                "attrs": {"level": level},
-                "content": [{"type": "text", "text": block_content}]
-            })
-            
-        elif block_type == 'text':
-            content.append({
-                "type": "paragraph",
-                "content": parse_inline_formatting(block_content)
-            })
-            
-        elif block_type == 'quote':
-            content.append({
-                "type": "blockquote",
-                "content": [{
-                    "type": "paragraph",
-                    "content": [{"type": "text", "text": block_content}]
-                }]
-            })
-            
-        elif block_type == 'pullquote':
-            content.append({
-                "type": "pullquote",
-                "attrs": {"align": None, "color": None},
-                "content": [{
-                    "type": "paragraph",
-                    "content": [{"type": "text", "text": block_content}]
-                }]
-            })
-            
-        elif block_type == 'list':
-            items = [item.strip() for item in block_content.split('•') if item.strip()]
-            list_items = []
-            for item in items:
-                list_items.append({
-                    "type": "list_item",
-                    "content": [{
-                        "type": "paragraph",
-                        "content": parse_inline_formatting(item)
-                    }]
-                })
-            content.append({
-                "type": "bullet_list",
-                "content": list_items
-            })
-            
-        elif block_type == 'numberlist':
-            # Split by numbers (1. 2. 3. etc.)
-            items = re.split(r'\d+\.', block_content)[1:]  # Skip first empty element
-            items = [item.strip() for item in items if item.strip()]
-            list_items = []
-            for item in items:
-                list_items.append({
-                    "type": "list_item",
-                    "content": [{
-                        "type": "paragraph",
-                        "content": parse_inline_formatting(item)
-                    }]
-                })
-            content.append({
-                "type": "ordered_list",
-                "attrs": {"start": 1, "order": 1},
-                "content": list_items
-            })
-            
-        elif block_type == 'code':
-            # Format: language | code content
-            parts = block_content.split('|', 1)
-            if len(parts) == 2:
-                language = parts[0].strip() or None
-                code = parts[1].strip()
-            else:
-                language = None
-                code = block_content
-            
-            content.append({
-                "type": "code_block",
-                "attrs": {"language": language},
-                "content": [{"type": "text", "text": code}]
-            })
-            
-        elif block_type == 'rule':
-            content.append({"type": "horizontal_rule"})
-            
-        elif block_type == 'button':
-            # Format: Button Text -> url
-            if '->' in block_content:
-                text, url = block_content.split('->', 1)
-                text = text.strip()
-                url = url.strip()
-            else:
-                text = block_content
-                url = "#"
-            
-            content.append({
-                "type": "button",
-                "attrs": {
-                    "url": url,
-                    "text": text,
-                    "action": None,
-                    "class": None
-                }
-            })
-            
-        elif block_type == 'subscribe':
-            content.append({
-                "type": "button",
-                "attrs": {
-                    "url": "%%checkout_url%%",
-                    "text": block_content,
-                    "action": None,
-                    "class": None
-                }
-            })
-            
-        elif block_type == 'share':
-            content.append({
-                "type": "button", 
-                "attrs": {
-                    "url": "%%share_url%%",
-                    "text": block_content,
-                    "action": None,
-                    "class": None
-                }
-            })
-            
-        elif block_type == 'comment':
-            content.append({
-                "type": "button",
-                "attrs": {
-                    "url": "%%half_magic_comments_url%%",
-                    "text": block_content,
-                    "action": None,
-                    "class": None
-                }
-            })
-            
-        elif block_type == 'subscribewidget':
-            # Format: Button >> Description
-            if '>>' in block_content:
-                button_text, description = block_content.split('>>', 1)
-                button_text = button_text.strip()
-                description = description.strip()
-            else:
-                button_text = block_content
-                description = "Subscribe for more content!"
-                
-            content.append({
-                "type": "subscribeWidget",
-                "attrs": {
-                    "url": "%%checkout_url%%",
-                    "text": button_text,
-                    "language": "en"
-                },
-                "content": [{
-                    "type": "ctaCaption",
-                    "content": [{"type": "text", "text": description}]
-                }]
-            })
-            
-        elif block_type == 'sharewidget':
-            # Format: Button >> Description
-            if '>>' in block_content:
-                button_text, description = block_content.split('>>', 1)
-                button_text = button_text.strip()
-                description = description.strip()
-            else:
-                button_text = block_content
-                description = "Share this post!"
-                
-            content.append({
-                "type": "captionedShareButton",
-                "attrs": {
-                    "url": "%%share_url%%",
-                    "text": button_text
-                },
-                "content": [{
-                    "type": "ctaCaption",
-                    "content": [{"type": "text", "text": description}]
-                }]
-            })
-            
-        elif block_type == 'latex':
-            content.append({
-                "type": "latex_block",
-                "attrs": {
-                    "persistentExpression": block_content,
-                    "id": f"EQUATION_{footnote_counter}"
-                }
-            })
-            footnote_counter += 1
-            
-        elif block_type == 'footnote':
-            # Format: [1] footnote text
-            match = re.match(r'\[(\d+)\]\s*(.*)', block_content)
-            if match:
-                num = int(match.group(1))
-                text = match.group(2)
-                
-                # Add footnote anchor in text (this should be done manually by user in Text:: blocks)
-                # Add footnote definition at end
-                content.append({
-                    "type": "footnote",
-                    "attrs": {"number": num},
-                    "content": [{
-                        "type": "paragraph", 
-                        "content": [{"type": "text", "text": text}]
-                    }]
-                })
-                
-        elif block_type == 'break':
-            content.append({"type": "paragraph"})
+        
+        handler = get_handler(block_type)
+        if handler:
+            node = handler(block_content, ctx)
+            if node:
+                append(node)
     
     return {"type": "doc", "content": content}
 
 
 def parse_inline_formatting(text):
     """Parse inline formatting like **bold**, *italic*, [links](url), etc."""
+    # Plain prose has no marker characters, so skip the regex scan entirely
+    if not any(marker in text for marker in _INLINE_MARKERS):
+        return [{"type": "text", "text": text}]
+    
     elements = []
     current_pos = 0
     
-    # Patterns for different formatting
-    patterns = [
-        (r'\*\*(.*?)\*\*', 'strong'),      # **bold**
-        (r'\*(.*?)\*', 'em'),              # *italic*  
-        (r'~~(.*?)~~', 'strikethrough'),   # ~~strikethrough~~
-        (r'`(.*?)`', 'code'),              # `code`
-        (r'\[([^\]]+)\]\(([^)]+)\)', 'link')  # [text](url)
-    ]
-    
-    # Find all formatting matches
-    matches = []
-    for pattern, format_type in patterns:
-        for match in re.finditer(pattern, text):
-            matches.append((match.start(), match.end(), format_type, match))
-    
-    # Sort by position
-    matches.sort(key=lambda x: x[0])
-    
-    for start, end, format_type, match in matches:
+    for match in _INLINE_RE.finditer(text):
+        start = match.start()
+        format_type = match.lastgroup
+        # Inner capture groups follow the named group that matched
+        group_index = match.lastindex
+        
         # Add text before this match
+        # CRITICAL FIX: Skip whitespace-only text elements that break Substack
         if start > current_pos:
             plain_text = text[current_pos:start]
-            if plain_text:
+            if plain_text.strip():
                 elements.append({"type": "text", "text": plain_text})
         
         # Add formatted text
         if format_type == 'link':
-            link_text = match.group(1)
-            link_url = match.group(2)
-            elements.append({
-                "type": "text",
-                "text": link_text,
-                "marks": [{
-                    "type": "link",
-                    "attrs": {
-                        "href": link_url,
-                        "target": "_blank",
-                        "rel": "noopener noreferrer nofollow",
-                        "class": None
-                    }
-                }]
-            })
+            link_text, link_url = match.group(group_index + 1, group_index + 2)
+            if link_text.strip():
+                elements.append({
+                    "type": "text",
+                    "text": link_text,
+                    "marks": [{
+                        "type": "link",
+                        "attrs": {**_LINK_MARK_ATTRS, "href": link_url}
+                    }]
+                })
         else:
-            formatted_text = match.group(1)
-            elements.append({
-                "type": "text", 
-                "text": formatted_text,
-                "marks": [{"type": format_type}]
-            })
+            formatted_text = match.group(group_index + 1)
+            if formatted_text.strip():
+                elements.append({
+                    "type": "text", 
+                    "text": formatted_text,
+                    "marks": [{"type": format_type}]
+                })
         
-        current_pos = end
+        current_pos = match.end()
     
     # Add remaining text
     if current_pos < len(text):
         remaining_text = text[current_pos:]
-        if remaining_text:
+        if remaining_text.strip():
             elements.append({"type": "text", "text": remaining_text})
     
-    # If no formatting found, return simple text
-    if not elements:
-        elements = [{"type": "text", "text": text}]
-    
-    # CRITICAL FIX: Remove empty text elements that break Substack
-    elements = [elem for elem in elements if elem.get('text', '').strip() != '']
-    
-    # If all elements were empty, return simple text
+    # If no formatting found or all elements were empty, return simple text
     if not elements:
         elements = [{"type": "text", "text": text}]
     
     return elements
 
 
-def create_markup_draft(title, markup_content, subtitle=""):
-    """Create a draft from user-friendly markup"""
-    content_json = parse_markup_to_json(markup_content)
-    return create_draft(title, subtitle, content_json=content_json)
+def parse_markup_to_json_str(markup_text):
+    """Parse markup and return the serialized draft_body string"""
+    return _dumps(parse_markup_to_json(markup_text))
 
 
-def create_draft(title, subtitle="", content_text="", content_json=None):
-    """Create a draft using the working method"""
+def create_markup_draft(title, markup_content, subtitle="", parsed_content=None):
+    """Create a draft from user-friendly markup
     
-    print(f"Creating draft: '{title}'")
-    if subtitle:
-        print(f"With subtitle: '{subtitle}'")
-    if content_json:
-        print(f"With JSON content: {len(content_json.get('content', []))} blocks")
-        print(f"Content preview: {str(content_json)[:200]}...")
-    elif content_text:
-        print(f"With text content: {len(content_text)} characters")
+    Pass parsed_content (the result of parse_markup_to_json) to skip re-parsing.
+    """
+    if parsed_content is not None:
+        content_str = _dumps(parsed_content)
+    else:
+        content_str = parse_markup_to_json_str(markup_content)
+    return create_draft(title, subtitle, content_json=content_str)
+
+
+# Sanitized reference-draft templates keyed by publication URL
+_REFERENCE_CACHE = {}
+_REFERENCE_LOCK = threading.Lock()
+
+
+def _get_reference_draft():
+    """Get the sanitized reference draft template, fetching it on first use"""
+    template = _REFERENCE_CACHE.get(pub_url)
+    if template is not None:
+        return template
     
+    # Only one thread refetches; the others wait and reuse its result
+    with _REFERENCE_LOCK:
+        template = _REFERENCE_CACHE.get(pub_url)
+        if template is None:
+            template = _fetch_reference_draft()
+            if template is not None:
+                _REFERENCE_CACHE[pub_url] = template
+        return template
+
+
+def _fetch_reference_draft():
+    """Fetch an unpublished draft and strip it down to a reusable template"""
     # Get existing drafts for reference
     drafts_response = session.get(f"{pub_url}/api/v1/drafts")
     if drafts_response.status_code != 200:
-        print("Error: Can't get drafts")
+        logger.error("Error: Can't get drafts")
         return None
         
-    drafts = drafts_response.json()
+    drafts = _loads(drafts_response.content)
     if len(drafts) == 0:
-        print("Error: No existing drafts found. Create one manually first.")
+        logger.error("Error: No existing drafts found. Create one manually first.")
         return None
     
     # Get reference draft structure - use UNPUBLISHED draft
-    reference_id = None
-    for draft in drafts:
-        if not draft.get('is_published', False):
-            reference_id = draft["id"]
-            break
+    reference_id = next(
+        (draft["id"] for draft in drafts if not draft.get('is_published', False)),
+        None
+    )
     
     if not reference_id:
-        print("Error: No unpublished draft found for reference")
+        logger.error("Error: No unpublished draft found for reference")
         return None
     
     ref_response = session.get(f"{pub_url}/api/v1/drafts/{reference_id}")
     if ref_response.status_code != 200:
-        print("Error: Can't get reference draft")
+        logger.error("Error: Can't get reference draft")
         return None
     
-    reference_draft = ref_response.json()
-    print(f"Using unpublished draft {reference_id} as reference")
+    reference_draft = _loads(ref_response.content)
+    logger.info("Using unpublished draft %s as reference", reference_id)
     
-    # Create new draft data
-    draft_data = reference_draft.copy()
+    template = reference_draft.copy()
     
     # Remove fields that shouldn't be copied
     remove_fields = ['id', 'uuid', 'created_at', 'updated_at', 'slug', 'draft_created_at', 'draft_updated_at']
     for field in remove_fields:
-        draft_data.pop(field, None)
+        template.pop(field, None)
+    
+    # Fix required fields
+    template['should_send_email'] = True
+    template['section_chosen'] = False  
+    template['subscriber_set_id'] = 1
+    
+    # THE KEY FIX: Set byline id = user_id
+    # Built once here and shared read-only by every draft created from it
+    template['draft_bylines'] = [
+        {
+            'user_id': byline['user_id'],
+            'is_draft': True,
+            'is_guest': byline.get('is_guest', False),
+            'id': byline['user_id']  # MAGIC FIX: id = user_id
+        }
+        for byline in reference_draft.get('postBylines', [])
+    ]
+    
+    return template
+
+
+def invalidate_reference_cache():
+    """Forget the cached reference draft so the next create_draft refetches it"""
+    _REFERENCE_CACHE.clear()
+
+
+# Serialized draft bodies for the text-only and empty cases
+_TEXT_DOC_PREFIX = '{"type":"doc","content":[{"type":"paragraph","content":[{"type":"text","text":'
+_TEXT_DOC_SUFFIX = '}]}]}'
+_EMPTY_DOC = '{"type":"doc","content":[]}'
+
+# POST failures that mean the cached reference draft is stale. Rate limits
+# (429) and other client errors leave it in place.
+_STALE_REFERENCE_STATUSES = (401, 403, 404)
+
+
+def create_draft(title, subtitle="", content_text="", content_json=None):
+    """Create a draft using the working method
+    
+    content_json may be a content dict or an already-serialized draft_body string.
+    """
+    
+    logger.info("Creating draft: '%s'", title)
+    if subtitle:
+        logger.debug("With subtitle: '%s'", subtitle)
+    if content_json:
+        # Serialize once up front; the preview is sliced from the same string
+        if isinstance(content_json, str):
+            content_str = content_json
+            logger.debug("With JSON content: %d characters", len(content_str))
+        else:
+            content_str = _dumps(content_json)
+            logger.debug("With JSON content: %d blocks", len(content_json.get('content', [])))
+        logger.debug("Content preview: %s...", content_str[:200])
+    elif content_text:
+        logger.debug("With text content: %d characters", len(content_text))
+    
+    template = _get_reference_draft()
+    if template is None:
+        return None
+    
+    # Create new draft data; only top-level keys are replaced below, so a
+    # shallow copy leaves the cached template untouched
+    draft_data = template.copy()
     
     # Set our new values
     draft_data['draft_title'] = title
@@ -438,351 +584,355 @@ def create_draft(title, subtitle="", content_text="", content_json=None):
     
     # Handle content
     if content_json:
-        # Use provided JSON structure
-        content_str = json.dumps(content_json)
-        print(f"Setting draft_body to JSON with {len(content_str)} characters")
+        # Use provided JSON structure (serialized above)
+        logger.debug("Setting draft_body to JSON with %d characters", len(content_str))
         draft_data['draft_body'] = content_str
     elif content_text:
-        # Create simple paragraph from text
-        content_structure = {
-            "type": "doc",
-            "content": [
-                {
-                    "type": "paragraph",
-                    "content": [{"type": "text", "text": content_text}]
-                }
-            ]
-        }
-        content_str = json.dumps(content_structure)
-        print(f"Setting draft_body to text paragraph with {len(content_str)} characters")
+        # Create simple paragraph from text; only the text itself needs encoding
+        content_str = _TEXT_DOC_PREFIX + _dumps(content_text) + _TEXT_DOC_SUFFIX
+        logger.debug("Setting draft_body to text paragraph with %d characters", len(content_str))
         draft_data['draft_body'] = content_str
     else:
         # Empty content
-        print("Setting draft_body to empty content")
-        draft_data['draft_body'] = '{"type":"doc","content":[]}'
-    
-    # Fix required fields
-    draft_data['should_send_email'] = True
-    draft_data['section_chosen'] = False  
-    draft_data['subscriber_set_id'] = 1
-    
-    # THE KEY FIX: Set byline id = user_id
-    draft_bylines = []
-    for byline in reference_draft.get('postBylines', []):
-        fixed_byline = {
-            'user_id': byline['user_id'],
-            'is_draft': True,
-            'is_guest': byline.get('is_guest', False),
-            'id': byline['user_id']  # MAGIC FIX: id = user_id
-        }
-        draft_bylines.append(fixed_byline)
-    
-    draft_data['draft_bylines'] = draft_bylines
+        logger.debug("Setting draft_body to empty content")
+        draft_data['draft_body'] = _EMPTY_DOC
     
     # Create the draft
-    print(f"Sending POST request to create draft...")
-    print(f"Draft data keys: {list(draft_data.keys())}")
+    logger.debug("Sending POST request to create draft...")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Draft data keys: %s", list(draft_data.keys()))
     
-    response = session.post(f"{pub_url}/api/v1/drafts", json=draft_data)
+    # Serialize the payload ourselves so it is sent compact (Content-Type is set on the session)
+    response = session.post(f"{pub_url}/api/v1/drafts", data=_dumps_bytes(draft_data))
     
     if response.status_code == 200:
-        draft = response.json()
-        print(f"SUCCESS! Draft created with ID: {draft['id']}")
-        print(f"Title: {draft.get('draft_title')}")
-        print(f"Subtitle: {draft.get('draft_subtitle')}")
+        draft = _loads(response.content)
+        logger.info("SUCCESS! Draft created with ID: %s", draft['id'])
+        logger.debug("Title: %s", draft.get('draft_title'))
+        logger.debug("Subtitle: %s", draft.get('draft_subtitle'))
         
-        # Check if content was actually saved
-        if 'draft_body' in draft:
+        # Check if content was actually saved (only parsed when debugging)
+        if 'draft_body' in draft and logger.isEnabledFor(logging.DEBUG):
             body_content = draft['draft_body']
             if isinstance(body_content, str):
                 try:
-                    parsed_body = json.loads(body_content)
+                    parsed_body = _loads(body_content)
                     content_blocks = parsed_body.get('content', [])
-                    print(f"Draft body contains {len(content_blocks)} content blocks")
+                    logger.debug("Draft body contains %d content blocks", len(content_blocks))
                     for i, block in enumerate(content_blocks):
-                        print(f"  Block {i}: {block.get('type', 'unknown')}")
+                        logger.debug("  Block %d: %s", i, block.get('type', 'unknown'))
                 except Exception as e:
-                    print(f"Draft body is string with {len(body_content)} characters")
-                    print(f"JSON parse error: {e}")
+                    logger.debug("Draft body is string with %d characters", len(body_content))
+                    logger.debug("JSON parse error: %s", e)
         
         return draft
     else:
-        print(f"FAILED: Status {response.status_code}")
-        print(f"Response: {response.text}")
+        logger.error("FAILED: Status %s", response.status_code)
+        logger.error("Response: %s", response.text)
+        if response.status_code in _STALE_REFERENCE_STATUSES:
+            # Credentials or the reference publication changed; refetch next time
+            invalidate_reference_cache()
         return None
 
-def create_comprehensive_test_draft(title="Complete Content Test", subtitle="Testing all Substack content types"):
-    """Create a comprehensive test draft with ALL discovered content types"""
+def create_drafts_batch(specs, max_workers=8):
+    """Create several drafts concurrently
     
-    user_id = os.getenv("USER_ID", "your_user_id")  # Get from env
+    Each spec is a dict of create_draft keyword arguments. Results come back
+    in the same order as specs, with None for drafts that failed.
+    """
+    specs = list(specs)
     
-    comprehensive_content = {
-        "type": "doc",
-        "content": [
-            # H1-H6 Headings
-            {
-                "type": "heading",
-                "attrs": {"level": 1},
-                "content": [{"type": "text", "text": "H1: Main Heading"}]
-            },
-            {
-                "type": "heading", 
-                "attrs": {"level": 2},
-                "content": [{"type": "text", "text": "H2: Section Heading"}]
-            },
-            {
-                "type": "heading",
-                "attrs": {"level": 3}, 
-                "content": [{"type": "text", "text": "H3: Subsection"}]
-            },
-            
-            # Text formatting paragraph
-            {
+    # Fetch the reference draft once up front so every worker hits the cache
+    if _get_reference_draft() is None:
+        return [None] * len(specs)
+    
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(_create_draft_or_none, spec) for spec in specs]
+        return [future.result() for future in futures]
+
+
+def _create_draft_or_none(spec):
+    """Run create_draft for one batch spec, turning request errors into None"""
+    # One failed POST must not hide the IDs of drafts the others created
+    try:
+        return create_draft(**spec)
+    except requests.RequestException as e:
+        logger.error("Error creating draft '%s': %s", spec.get('title'), e)
+        return None
+
+# Every block type create_comprehensive_test_draft exercises. It only depends
+# on the import-time config snapshot, so it is built and serialized once.
+_COMPREHENSIVE_CONTENT = {
+    "type": "doc",
+    "content": [
+        # H1-H6 Headings
+        {
+            "type": "heading",
+            "attrs": {"level": 1},
+            "content": [{"type": "text", "text": "H1: Main Heading"}]
+        },
+        {
+            "type": "heading", 
+            "attrs": {"level": 2},
+            "content": [{"type": "text", "text": "H2: Section Heading"}]
+        },
+        {
+            "type": "heading",
+            "attrs": {"level": 3}, 
+            "content": [{"type": "text", "text": "H3: Subsection"}]
+        },
+        
+        # Text formatting paragraph
+        {
+            "type": "paragraph",
+            "content": [
+                {"type": "text", "text": "Text formatting examples: "},
+                {"type": "text", "text": "bold", "marks": [{"type": "strong"}]},
+                {"type": "text", "text": ", "},
+                {"type": "text", "text": "italic", "marks": [{"type": "em"}]},
+                {"type": "text", "text": ", "},
+                {"type": "text", "text": "strikethrough", "marks": [{"type": "strikethrough"}]},
+                {"type": "text", "text": ", "},
+                {"type": "text", "text": "inline code", "marks": [{"type": "code"}]},
+                {"type": "text", "text": ", and "},
+                {
+                    "type": "text", 
+                    "text": "a link",
+                    "marks": [{
+                        "type": "link",
+                        "attrs": {
+                            "href": "https://example.com",
+                            "target": "_blank",
+                            "rel": "noopener noreferrer nofollow",
+                            "class": None
+                        }
+                    }]
+                },
+                {"type": "text", "text": "."}
+            ]
+        },
+        
+        # Empty paragraph (line break)
+        {"type": "paragraph"},
+        
+        # Block Quote
+        {
+            "type": "blockquote",
+            "content": [{
                 "type": "paragraph",
-                "content": [
-                    {"type": "text", "text": "Text formatting examples: "},
-                    {"type": "text", "text": "bold", "marks": [{"type": "strong"}]},
-                    {"type": "text", "text": ", "},
-                    {"type": "text", "text": "italic", "marks": [{"type": "em"}]},
-                    {"type": "text", "text": ", "},
-                    {"type": "text", "text": "strikethrough", "marks": [{"type": "strikethrough"}]},
-                    {"type": "text", "text": ", "},
-                    {"type": "text", "text": "inline code", "marks": [{"type": "code"}]},
-                    {"type": "text", "text": ", and "},
-                    {
-                        "type": "text", 
-                        "text": "a link",
-                        "marks": [{
-                            "type": "link",
-                            "attrs": {
-                                "href": "https://example.com",
-                                "target": "_blank",
-                                "rel": "noopener noreferrer nofollow",
-                                "class": None
-                            }
-                        }]
-                    },
-                    {"type": "text", "text": "."}
-                ]
-            },
-            
-            # Empty paragraph (line break)
-            {"type": "paragraph"},
-            
-            # Block Quote
-            {
-                "type": "blockquote",
-                "content": [{
-                    "type": "paragraph",
-                    "content": [{"type": "text", "text": "This is a block quote example."}]
-                }]
-            },
-            
-            # Pull Quote (emphasized)
-            {
-                "type": "pullquote",
-                "attrs": {"align": None, "color": None},
-                "content": [{
-                    "type": "paragraph", 
-                    "content": [{"type": "text", "text": "This is an emphasized pull quote."}]
-                }]
-            },
-            
-            # Bullet List
-            {
-                "type": "bullet_list",
-                "content": [
-                    {
-                        "type": "list_item",
-                        "content": [{
-                            "type": "paragraph",
-                            "content": [{"type": "text", "text": "First bullet point"}]
-                        }]
-                    },
-                    {
-                        "type": "list_item", 
-                        "content": [{
-                            "type": "paragraph",
-                            "content": [{"type": "text", "text": "Second bullet point"}]
-                        }]
-                    },
-                    {
-                        "type": "list_item",
-                        "content": [{
-                            "type": "paragraph",
-                            "content": [{"type": "text", "text": "Third bullet point"}]
-                        }]
-                    }
-                ]
-            },
-            
-            # Numbered List
-            {
-                "type": "ordered_list",
-                "attrs": {"start": 1, "order": 1},
-                "content": [
-                    {
-                        "type": "list_item",
-                        "content": [{
-                            "type": "paragraph", 
-                            "content": [{"type": "text", "text": "First numbered item"}]
-                        }]
-                    },
-                    {
-                        "type": "list_item",
-                        "content": [{
-                            "type": "paragraph",
-                            "content": [{"type": "text", "text": "Second numbered item"}] 
-                        }]
-                    }
-                ]
-            },
-            
-            # Code Block
-            {
-                "type": "code_block",
-                "attrs": {"language": "python"},
-                "content": [{
-                    "type": "text",
-                    "text": 'print("Hello, Substack!")\nfor i in range(3):\n    print(f"Item {i}")'
-                }]
-            },
-            
-            # Horizontal Rule
-            {"type": "horizontal_rule"},
-            
-            {"type": "paragraph", "content": [{"type": "text", "text": "Content above and below the horizontal rule."}]},
-            
-            {"type": "horizontal_rule"},
-            
-            # Subscribe Button
-            {
-                "type": "button",
-                "attrs": {
-                    "url": "%%checkout_url%%", 
-                    "text": "Subscribe Now",
-                    "action": None,
-                    "class": None
-                }
-            },
-            
-            # Subscribe Widget with Caption
-            {
-                "type": "subscribeWidget",
-                "attrs": {
-                    "url": "%%checkout_url%%",
-                    "text": "Subscribe",
-                    "language": "en"
+                "content": [{"type": "text", "text": "This is a block quote example."}]
+            }]
+        },
+        
+        # Pull Quote (emphasized)
+        {
+            "type": "pullquote",
+            "attrs": {"align": None, "color": None},
+            "content": [{
+                "type": "paragraph", 
+                "content": [{"type": "text", "text": "This is an emphasized pull quote."}]
+            }]
+        },
+        
+        # Bullet List
+        {
+            "type": "bullet_list",
+            "content": [
+                {
+                    "type": "list_item",
+                    "content": [{
+                        "type": "paragraph",
+                        "content": [{"type": "text", "text": "First bullet point"}]
+                    }]
                 },
-                "content": [{
-                    "type": "ctaCaption",
+                {
+                    "type": "list_item", 
                     "content": [{
-                        "type": "text",
-                        "text": "Thanks for reading! Subscribe for more content like this."
+                        "type": "paragraph",
+                        "content": [{"type": "text", "text": "Second bullet point"}]
                     }]
-                }]
-            },
-            
-            # Share Button  
-            {
-                "type": "button",
-                "attrs": {
-                    "url": "%%share_url%%",
-                    "text": "Share this post",
-                    "action": None,
-                    "class": None
-                }
-            },
-            
-            # Share Button with Caption
-            {
-                "type": "captionedShareButton",
-                "attrs": {
-                    "url": "%%share_url%%",
-                    "text": "Share"
                 },
-                "content": [{
-                    "type": "ctaCaption", 
+                {
+                    "type": "list_item",
                     "content": [{
-                        "type": "text",
-                        "text": "If you found this helpful, please share it with others!"
+                        "type": "paragraph",
+                        "content": [{"type": "text", "text": "Third bullet point"}]
                     }]
-                }]
-            },
-            
-            # Custom Button
-            {
-                "type": "button",
-                "attrs": {
-                    "url": "https://github.com",
-                    "text": "Visit GitHub",
-                    "action": None,
-                    "class": None
-                }
-            },
-            
-            # Comment Button
-            {
-                "type": "button", 
-                "attrs": {
-                    "url": "%%half_magic_comments_url%%",
-                    "text": "Leave a comment",
-                    "action": None,
-                    "class": None
-                }
-            },
-            
-            # Direct Message Button
-            {
-                "type": "directMessage",
-                "attrs": {
-                    "userId": 370411012,  # Replace with your user ID
-                    "userName": user_id,
-                    "canDm": None,
-                    "dmUpgradeOptions": None,
-                    "isEditorNode": True,
-                    "isEditor": True
                 }
-            },
-            
-            # LaTeX Block  
-            {
-                "type": "latex_block",
-                "attrs": {
-                    "persistentExpression": "E = mc^2",
-                    "id": "EINSTEIN_EQUATION"
+            ]
+        },
+        
+        # Numbered List
+        {
+            "type": "ordered_list",
+            "attrs": {"start": 1, "order": 1},
+            "content": [
+                {
+                    "type": "list_item",
+                    "content": [{
+                        "type": "paragraph", 
+                        "content": [{"type": "text", "text": "First numbered item"}]
+                    }]
+                },
+                {
+                    "type": "list_item",
+                    "content": [{
+                        "type": "paragraph",
+                        "content": [{"type": "text", "text": "Second numbered item"}] 
+                    }]
                 }
+            ]
+        },
+        
+        # Code Block
+        {
+            "type": "code_block",
+            "attrs": {"language": "python"},
+            "content": [{
+                "type": "text",
+                "text": 'print("Hello, Substack!")\nfor i in range(3):\n    print(f"Item {i}")'
+            }]
+        },
+        
+        # Horizontal Rule
+        {"type": "horizontal_rule"},
+        
+        {"type": "paragraph", "content": [{"type": "text", "text": "Content above and below the horizontal rule."}]},
+        
+        {"type": "horizontal_rule"},
+        
+        # Subscribe Button
+        {
+            "type": "button",
+            "attrs": {
+                "url": "%%checkout_url%%", 
+                "text": "Subscribe Now",
+                "action": None,
+                "class": None
+            }
+        },
+        
+        # Subscribe Widget with Caption
+        {
+            "type": "subscribeWidget",
+            "attrs": {
+                "url": "%%checkout_url%%",
+                "text": "Subscribe",
+                "language": "en"
             },
-            
-            # Footnote example
-            {
-                "type": "paragraph",
-                "content": [
-                    {"type": "text", "text": "This statement needs a footnote"},
-                    {"type": "footnoteAnchor", "attrs": {"number": 1}},
-                    {"type": "text", "text": " to support it."}
-                ]
+            "content": [{
+                "type": "ctaCaption",
+                "content": [{
+                    "type": "text",
+                    "text": "Thanks for reading! Subscribe for more content like this."
+                }]
+            }]
+        },
+        
+        # Share Button  
+        {
+            "type": "button",
+            "attrs": {
+                "url": "%%share_url%%",
+                "text": "Share this post",
+                "action": None,
+                "class": None
+            }
+        },
+        
+        # Share Button with Caption
+        {
+            "type": "captionedShareButton",
+            "attrs": {
+                "url": "%%share_url%%",
+                "text": "Share"
             },
-            
-            {"type": "paragraph"},
-            {"type": "paragraph"},
-            
-            # Footnote definition
-            {
-                "type": "footnote",
-                "attrs": {"number": 1},
+            "content": [{
+                "type": "ctaCaption", 
                 "content": [{
-                    "type": "paragraph",
-                    "content": [{
-                        "type": "text",
-                        "text": "This is the footnote explaining the statement above."
-                    }]
+                    "type": "text",
+                    "text": "If you found this helpful, please share it with others!"
                 }]
+            }]
+        },
+        
+        # Custom Button
+        {
+            "type": "button",
+            "attrs": {
+                "url": "https://github.com",
+                "text": "Visit GitHub",
+                "action": None,
+                "class": None
             }
-        ]
-    }
-    
-    return create_draft(title, subtitle, content_json=comprehensive_content)
+        },
+        
+        # Comment Button
+        {
+            "type": "button", 
+            "attrs": {
+                "url": "%%half_magic_comments_url%%",
+                "text": "Leave a comment",
+                "action": None,
+                "class": None
+            }
+        },
+        
+        # Direct Message Button
+        {
+            "type": "directMessage",
+            "attrs": {
+                "userId": 370411012,  # Replace with your user ID
+                "userName": _USER_ID or "your_user_id",  # Get from env
+                "canDm": None,
+                "dmUpgradeOptions": None,
+                "isEditorNode": True,
+                "isEditor": True
+            }
+        },
+        
+        # LaTeX Block  
+        {
+            "type": "latex_block",
+            "attrs": {
+                "persistentExpression": "E = mc^2",
+                "id": "EINSTEIN_EQUATION"
+            }
+        },
+        
+        # Footnote example
+        {
+            "type": "paragraph",
+            "content": [
+                {"type": "text", "text": "This statement needs a footnote"},
+                {"type": "footnoteAnchor", "attrs": {"number": 1}},
+                {"type": "text", "text": " to support it."}
+            ]
+        },
+        
+        {"type": "paragraph"},
+        {"type": "paragraph"},
+        
+        # Footnote definition
+        {
+            "type": "footnote",
+            "attrs": {"number": 1},
+            "content": [{
+                "type": "paragraph",
+                "content": [{
+                    "type": "text",
+                    "text": "This is the footnote explaining the statement above."
+                }]
+            }]
+        }
+    ]
+}
+_COMPREHENSIVE_CONTENT_JSON = _dumps(_COMPREHENSIVE_CONTENT)
+
+
+def create_comprehensive_test_draft(title="Complete Content Test", subtitle="Testing all Substack content types"):
+    """Create a comprehensive test draft with ALL discovered content types"""
+    return create_draft(title, subtitle, content_json=_COMPREHENSIVE_CONTENT_JSON)
 
 
 def create_rich_draft(title, subtitle=""):
@@ -821,6 +971,9 @@ def create_rich_draft(title, subtitle=""):
     return create_draft(title, subtitle, content_json=rich_content)
 
 if __name__ == "__main__":
+    # Show create_draft progress on the console; use DEBUG for full diagnostics
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    
     print("=== SUBSTACK DRAFT CREATION ===")
     print("\nChoose draft type:")
     print("1. Simple text draft (interactive)")
@@ -857,38 +1010,36 @@ if __name__ == "__main__":
         sample_file = "sampleinput/2.txt"
         
         try:
-            with open(sample_file, 'r', encoding='utf-8') as f:
-                markup_content = f.read().strip()
+            markup_content = Path(sample_file).read_text(encoding='utf-8').strip()
             
-            # Clean up line breaks and extra spaces
-            markup_content = markup_content.replace('\n', ' ').replace('\r', '')
-            markup_content = ' '.join(markup_content.split())  # Remove extra whitespace
+            # Collapse line breaks and runs of whitespace into single spaces
+            markup_content = ' '.join(markup_content.split())
             
             print(f"\nReading markup content from: {sample_file}")
             print(f"Content preview: {markup_content[:100]}{'...' if len(markup_content) > 100 else ''}")
             
             # Extract title from markup or use default
-            if "Title::" in markup_content:
-                # Find the title in the markup
-                title_part = markup_content.split("|")[0]
-                title = title_part.replace("Title::", "").strip()
+            title_match = _TITLE_RE.search(markup_content)
+            if title_match:
+                # Use the first Title:: block, wherever it appears
+                title = title_match.group(1).strip()
+                subtitle = ""
                 
                 # Check if title contains subtitle (format: Main Title: Subtitle)
                 if ":" in title and not title.startswith("http"):
-                    main_title, subtitle_part = title.split(":", 1)
+                    main_title, _, subtitle_part = title.partition(":")
                     title = main_title.strip()
                     subtitle = subtitle_part.strip()
                     print(f"Extracted title: '{title}'")
                     print(f"Extracted subtitle: '{subtitle}'")
                     
-                    # Also modify the markup to use proper structure
-                    modified_markup = markup_content.replace(
-                        f"Title:: {main_title.strip()}: {subtitle_part.strip()}", 
-                        f"Title:: {main_title.strip()} | Subtitle:: {subtitle_part.strip()}"
+                    # Also modify the markup to use proper structure by
+                    # rewriting just that block in place
+                    markup_content = (
+                        markup_content[:title_match.start(1)]
+                        + f" {title} | Subtitle:: {subtitle} "
+                        + markup_content[title_match.end(1):]
                     )
-                    markup_content = modified_markup
-                else:
-                    subtitle = ""
             else:
                 title = "Sample Markup Draft"
                 subtitle = ""
@@ -903,7 +1054,7 @@ if __name__ == "__main__":
             content_json = parse_markup_to_json(markup_content)
             print(f"Parsed {len(content_json['content'])} content blocks")
             
-            draft = create_markup_draft(title, markup_content, subtitle)
+            draft = create_markup_draft(title, markup_content, subtitle, parsed_content=content_json)
             
         except FileNotFoundError:
             print(f"Error: {sample_file} not found")
@@ -1,52 +1,133 @@
 # draft_publish.py - Publish Substack drafts
 import os
 import json
+import re
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
 
+# Use orjson for API (de)serialization when it is installed.
+# Both paths emit compact JSON (no whitespace after separators).
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    _dumps_bytes = orjson.dumps
+    _loads = orjson.loads
+else:
+    def _dumps_bytes(obj):
+        return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+    _loads = json.loads
+
 load_dotenv()
 
+# Snapshot configuration from the environment once at import
+_SID, _SUBSTACK_LLI, _SUBSTACK_SID, _PUB_URL = (
+    os.getenv(key)
+    for key in ("SID", "SUBSTACK_LLI", "SUBSTACK_SID", "PUBLICATION_URL")
+)
+
 # Setup session
 session = requests.Session()
 session.headers.update({
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-    "Referer": os.getenv("PUBLICATION_URL"),
+    "Referer": _PUB_URL,
     "Content-Type": "application/json"
 })
 
+# Keep connections alive across calls and retry transient gateway errors.
+# Read and status retries are limited to idempotent methods, and other
+# errors (e.g. SSLError) are not retried, so publish POSTs are never replayed;
+# only connect failures, raised before anything is sent, are retried.
+adapter = HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(
+        total=2,
+        backoff_factor=0.2,
+        status_forcelist=[502, 503, 504],
+        other=0,
+        raise_on_status=False
+    )
+)
+session.mount("https://", adapter)
+session.mount("http://", adapter)
+
 # Set cookies
 cookie_map = {
-    "sid": os.getenv("SID"),
-    "substack.lli": os.getenv("SUBSTACK_LLI"),
-    "substack.sid": os.getenv("SUBSTACK_SID")
+    "sid": _SID,
+    "substack.lli": _SUBSTACK_LLI,
+    "substack.sid": _SUBSTACK_SID
 }
 for k, v in cookie_map.items():
     if v:
         session.cookies.set(k, v, domain=".substack.com")
 
-pub_url = os.getenv("PUBLICATION_URL")
+pub_url = _PUB_URL
+
+# API base paths, built once
+_DRAFTS_URL = f"{pub_url}/api/v1/drafts"
+_POSTS_URL = f"{pub_url}/api/v1/posts"
+
+# Matches a draft body that opens with a block whose first child is a text node,
+# capturing that node's raw (still JSON-escaped) text
+_PREVIEW_RE = re.compile(
+    r'\s*\{\s*"type"\s*:\s*"doc"\s*,\s*"content"\s*:\s*\['
+    r'\s*\{\s*"type"\s*:\s*"[^"]*"\s*,\s*"content"\s*:\s*\['
+    r'\s*\{\s*"type"\s*:\s*"text"\s*,\s*"text"\s*:\s*"((?:[^"\\]|\\.)*)"'
+)
+
+def _preview_from_body(draft_body, length=80):
+    """Get the first characters of a draft body's opening text, or None
+    
+    The fast path decodes only the opening text node and does not validate
+    the rest of the body, so a truncated body can still yield a preview.
+    Bodies that need the full parse raise ValueError or TypeError if they
+    are not readable JSON.
+    """
+    match = _PREVIEW_RE.match(draft_body)
+    if match:
+        # Only decode the one string we need instead of the whole document
+        text = _loads(f'"{match.group(1)}"')
+    else:
+        # Any other layout (attrs, marks, non-text first node): parse it all
+        content = _loads(draft_body)
+        blocks = content.get('content')
+        inner = blocks[0].get('content') if blocks else None
+        text = inner[0].get('text') if inner else None
+    return text[:length] if text else None
 
 def get_drafts():
     """Get all drafts"""
-    response = session.get(f"{pub_url}/api/v1/drafts")
+    response = session.get(_DRAFTS_URL)
     if response.status_code == 200:
-        drafts = response.json()
+        drafts = _loads(response.content)
         print(f"Found {len(drafts)} drafts")
         return drafts
     else:
         print(f"Error getting drafts: {response.text}")
         return []
 
-def get_unpublished_drafts():
-    """Get only unpublished drafts for API"""
-    response = session.get(f"{pub_url}/api/v1/drafts")
-    if response.status_code == 200:
-        drafts = response.json()
-        # Filter only unpublished drafts
-        unpublished = [draft for draft in drafts if not draft.get('is_published', False)]
-        return unpublished
-    else:
-        return None
+def get_unpublished_drafts(drafts=None):
+    """Get only unpublished drafts for API
+    
+    Pass an already-fetched drafts list to filter it without another request.
+    """
+    if drafts is None:
+        response = session.get(_DRAFTS_URL)
+        if response.status_code != 200:
+            return None
+        drafts = _loads(response.content)
+    
+    # Filter only unpublished drafts; the API normally sends is_published
+    # on every draft, so index directly and only fall back to .get if not
+    try:
+        return [draft for draft in drafts if not draft['is_published']]
+    except KeyError:
+        return [draft for draft in drafts if not draft.get('is_published', False)]
 
 def publish_draft(draft_id, send_email=True, audience="everyone"):
     """Publish a draft immediately"""
@@ -61,10 +142,10 @@ def publish_draft(draft_id, send_email=True, audience="everyone"):
         "audience": audience  # "everyone" or "paid"
     }
     
-    response = session.post(f"{pub_url}/api/v1/drafts/{draft_id}/publish", json=publish_data)
+    response = session.post(f"{_DRAFTS_URL}/{draft_id}/publish", data=_dumps_bytes(publish_data))
     
     if response.status_code == 200:
-        result = response.json()
+        result = _loads(response.content)
         print(f"SUCCESS! Draft {draft_id} published!")
         
         # Get the published post URL if available
@@ -95,9 +176,9 @@ def publish_draft_paid_only(draft_id, send_email=True):
 
 def get_published_posts():
     """Get published posts"""
-    response = session.get(f"{pub_url}/api/v1/posts")
+    response = session.get(_POSTS_URL)
     if response.status_code == 200:
-        posts = response.json()
+        posts = _loads(response.content)
         print(f"Found {len(posts)} published posts")
         return posts
     else:
@@ -113,32 +194,31 @@ def list_drafts():
         print("No drafts found")
         return []
     
+    # Collect the listing and write it in one go
+    lines = []
     for draft in drafts:
-        print(f"Draft ID: {draft['id']}")
-        print(f"Title: {draft.get('draft_title', 'Untitled')}")
-        print(f"Subtitle: {draft.get('draft_subtitle', 'No subtitle')}")
-        print(f"Created: {draft.get('draft_created_at', 'Unknown')}")
-        print(f"Updated: {draft.get('draft_updated_at', 'Unknown')}")
+        lines.append(f"Draft ID: {draft['id']}")
+        lines.append(f"Title: {draft.get('draft_title', 'Untitled')}")
+        lines.append(f"Subtitle: {draft.get('draft_subtitle', 'No subtitle')}")
+        lines.append(f"Created: {draft.get('draft_created_at', 'Unknown')}")
+        lines.append(f"Updated: {draft.get('draft_updated_at', 'Unknown')}")
         
         # Show if scheduled
         if draft.get('post_date'):
-            print(f"Scheduled for: {draft['post_date']}")
+            lines.append(f"Scheduled for: {draft['post_date']}")
         
         # Show content preview
         draft_body = draft.get('draft_body', '{}')
         try:
-            content = json.loads(draft_body)
-            if content.get('content') and len(content['content']) > 0:
-                first_paragraph = content['content'][0]
-                if first_paragraph.get('content') and len(first_paragraph['content']) > 0:
-                    first_text = first_paragraph['content'][0]
-                    if first_text.get('text'):
-                        preview = first_text['text'][:100]
-                        print(f"Preview: {preview}...")
+            preview = _preview_from_body(draft_body, 100)
+            if preview:
+                lines.append(f"Preview: {preview}...")
         except:
-            print("Preview: [Content not readable]")
+            lines.append("Preview: [Content not readable]")
         
-        print("-" * 50)
+        lines.append("-" * 50)
+    
+    print("\n".join(lines))
     
     return drafts
 
@@ -147,10 +227,10 @@ def unpublish_post(post_id):
     
     print(f"Unpublishing post {post_id}...")
     
-    response = session.post(f"{pub_url}/api/v1/posts/{post_id}/unpublish", json={})
+    response = session.post(f"{_POSTS_URL}/{post_id}/unpublish", data=_dumps_bytes({}))
     
     if response.status_code == 200:
-        result = response.json()
+        result = _loads(response.content)
         print(f"SUCCESS! Post {post_id} unpublished (now a draft)")
         return result
     else:
@@ -166,20 +246,49 @@ def list_published_posts():
         print("No published posts found")
         return []
     
+    # Collect the listing and write it in one go
+    lines = []
     for post in posts[:10]:  # Show first 10
-        print(f"Post ID: {post['id']}")
-        print(f"Title: {post.get('title', 'Untitled')}")
-        print(f"Slug: {post.get('slug', 'no-slug')}")
-        print(f"Published: {post.get('post_date', 'Unknown')}")
+        lines.append(f"Post ID: {post['id']}")
+        lines.append(f"Title: {post.get('title', 'Untitled')}")
+        lines.append(f"Slug: {post.get('slug', 'no-slug')}")
+        lines.append(f"Published: {post.get('post_date', 'Unknown')}")
         
         if post.get('slug'):
             post_url = f"{pub_url}/p/{post['slug']}"
-            print(f"URL: {post_url}")
+            lines.append(f"URL: {post_url}")
         
-        print("-" * 40)
+        lines.append("-" * 40)
+    
+    print("\n".join(lines))
     
     return posts
 
+def _run_draft_create():
+    """Run draft_create.py as a script inside this interpreter.
+
+    Avoids starting a second Python process; returns its exit code.
+    """
+    import runpy
+    
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    previous_dir = os.getcwd()
+    # draft_create.py resolves sampleinput/ relative to the working directory
+    os.chdir(script_dir)
+    try:
+        runpy.run_path(os.path.join(script_dir, 'draft_create.py'), run_name="__main__")
+    except SystemExit as e:
+        if e.code is None:
+            return 0
+        return e.code if isinstance(e.code, int) else 1
+    except Exception as e:
+        # A crash in the child script is a failed run, as it was for the subprocess
+        print(f"\ndraft_create.py failed: {e!r}")
+        return 1
+    finally:
+        os.chdir(previous_dir)
+    return 0
+
 if __name__ == "__main__":
     print("=== SUBSTACK DRAFT PUBLISHING ===")
     
@@ -192,14 +301,9 @@ if __name__ == "__main__":
         create_new = input("Do you want to create a new draft? (y/n): ").lower().strip()
         if create_new == 'y':
             print("\nCalling draft_create.py...")
-            import subprocess
-            import sys
             
             # Call draft_create.py
-            result = subprocess.run([sys.executable, 'draft_create.py'], 
-                                  cwd=os.path.dirname(os.path.abspath(__file__)))
-            
-            if result.returncode == 0:
+            if _run_draft_create() == 0:
                 print("\nDraft created! Please run this script again to publish it.")
             else:
                 print("\nFailed to create draft.")
@@ -208,28 +312,27 @@ if __name__ == "__main__":
     
     # Show available drafts
     print(f"\n=== AVAILABLE DRAFTS ({len(drafts)}) ===")
-    unpublished_drafts = []
+    # Filter the list fetched above instead of requesting it again
+    unpublished_drafts = get_unpublished_drafts(drafts)
     
-    for i, draft in enumerate(drafts):
-        if not draft.get('is_published', False):
-            unpublished_drafts.append(draft)
-            print(f"{len(unpublished_drafts)}. ID: {draft['id']}")
-            print(f"   Title: {draft.get('draft_title', 'Untitled')}")
-            
-            # Show content preview
-            draft_body = draft.get('draft_body', '{}')
-            try:
-                content = json.loads(draft_body)
-                if content.get('content') and len(content['content']) > 0:
-                    first_paragraph = content['content'][0]
-                    if first_paragraph.get('content') and len(first_paragraph['content']) > 0:
-                        first_text = first_paragraph['content'][0]
-                        if first_text.get('text'):
-                            preview = first_text['text'][:80]
-                            print(f"   Preview: {preview}...")
-            except:
-                print("   Preview: [Content not readable]")
-            print()
+    # Collect the listing and write it in one go
+    lines = []
+    for number, draft in enumerate(unpublished_drafts, 1):
+        lines.append(f"{number}. ID: {draft['id']}")
+        lines.append(f"   Title: {draft.get('draft_title', 'Untitled')}")
+        
+        # Show content preview
+        draft_body = draft.get('draft_body', '{}')
+        try:
+            preview = _preview_from_body(draft_body)
+            if preview:
+                lines.append(f"   Preview: {preview}...")
+        except:
+            lines.append("   Preview: [Content not readable]")
+        lines.append("")
+    
+    if lines:
+        print("\n".join(lines))
     
     if not unpublished_drafts:
         print("No unpublished drafts found!")
@@ -237,13 +340,8 @@ if __name__ == "__main__":
         create_new = input("Do you want to create a new draft? (y/n): ").lower().strip()
         if create_new == 'y':
             print("\nCalling draft_create.py...")
-            import subprocess
-            import sys
-            
-            result = subprocess.run([sys.executable, 'draft_create.py'], 
-                                  cwd=os.path.dirname(os.path.abspath(__file__)))
             
-            if result.returncode == 0:
+            if _run_draft_create() == 0:
                 print("\nDraft created! Please run this script again to publish it.")
         
         exit()